@@ -0,0 +1,61 @@
+# gnx -- algorithms for graphs and networks
+# Copyright (C) 2016 Minh Van Nguyen <mvngu.name AT gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+"""
+Insert all hooks into the gnx library as well as the build system of gnx.  The
+targets are independent of each other, so we insert hooks into them
+concurrently.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import src_gnx, src_makefile, tests_makefile
+from ..util import parse_args
+
+###########################################################################
+# script starts here
+###########################################################################
+
+if __name__ == "__main__":
+    s = "Insert hooks into the gnx library and its build system.\n"
+    args = parse_args(s, [
+        ("--header", "file", "the master header file src/gnx.h"),
+        ("--src-makefile", "file", "the Makefile src/Makefile.am"),
+        ("--tests-makefile", "file", "the Makefile tests/Makefile.am"),
+        ("--installoc", "boolean", "install src/alloc.h"),
+    ])
+    installoc = args.installoc
+
+    # Check all arguments before inserting any hooks, so that a bad argument
+    # leaves every target untouched.
+    if installoc not in ("yes", "no"):
+        raise ValueError("Expected yes or no, got: %s" % installoc)
+    for target in (args.header, args.src_makefile, args.tests_makefile):
+        if not Path(target).is_file():
+            raise IOError("File not found: %s" % target)
+
+    tasks = [
+        (src_gnx.insert_hooks, args.header, installoc, src_gnx.PREFIX),
+        (src_makefile.insert_hooks, args.src_makefile, installoc,
+         src_makefile.PREFIX),
+        (tests_makefile.insert_hooks, args.tests_makefile,
+         tests_makefile.PREFIX),
+    ]
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [executor.submit(*task) for task in tasks]
+        for future in futures:
+            future.result()
@@ -17,15 +17,26 @@
 """
 Insert hooks into the master gnx.h header file of the gnx library.  Hooks are
 required for gnx to build with our custom wrappers to library functions.
+
+This module is part of the package script.hook.  Run it as a module from the
+tests directory, for example:
+
+    python -m script.hook.src_gnx --target ../src/gnx.h --installoc no
 """
 
-from os import path
-import argparse
-import os
-import sys
+from ..util import apply_hooks, decorate_hook, parse_args
+
+###########################################################################
+# generated code
+###########################################################################
+
+PREFIX = "/* GNX_HOOK:"
 
-sys.path.append(path.abspath(path.join(path.dirname(__file__), "..")))
-from util import decorate_hook
+BEGIN = "/* start of generated code */\n"
+TAG = "/* code generated from %s */\n" % __file__
+END = "/* end of generated code */\n"
+
+ALLOC_H_HOOK = decorate_hook('#include "alloc.h"\n', BEGIN, TAG, END)
 
 ###########################################################################
 # helper functions
@@ -40,30 +51,13 @@ def insert_hooks(target, installoc, prefix):
            public interface.
     @param prefix Insert a hook at the line that has this prefix string.
     """
-    assert installoc in ("yes", "no")
-    install_alloc = False
+    if installoc not in ("yes", "no"):
+        raise ValueError("Expected yes or no, got: %s" % installoc)
+    hooks = {}
     if installoc == "yes":
-        install_alloc = True
-
-    header_hook = prefix + "ALLOC_H */"
-    begin = "/* start of generated code */\n"
-    tag = "/* code generated from %s */\n" % __file__
-    end = "/* end of generated code */\n"
-    code = ""
-
-    with open(target, "r") as f:
-        for line in f:
-            if line.strip() == header_hook:
-                code += line
-                if install_alloc:
-                    hook = '#include "alloc.h"\n'
-                    code += decorate_hook(hook, begin, tag, end)
-                continue
+        hooks[prefix + "ALLOC_H */"] = ("", ALLOC_H_HOOK)
 
-            code += line
-
-    with open(target, "w") as f:
-        f.write(code)
+    apply_hooks(target, hooks, (prefix,), __file__, installoc, prefix)
 
 ###########################################################################
 # script starts here
@@ -71,17 +65,11 @@ def insert_hooks(target, installoc, prefix):
 
 if __name__ == "__main__":
     s = "Insert hooks into the master gnx.h header file.\n"
-    parser = argparse.ArgumentParser(description=s)
-    parser.add_argument("--target", metavar="file", required=True,
-                        help="insert hooks into this file")
-    parser.add_argument("--installoc", metavar="boolean", required=True,
-                        help="install src/alloc.h")
-    args = parser.parse_args()
+    args = parse_args(s, [
+        ("--target", "file", "insert hooks into this file"),
+        ("--installoc", "boolean", "install src/alloc.h"),
+    ])
     target = args.target
     installoc = args.installoc
 
-    if not path.exists(target):
-        raise IOError("File not found: %s" % target)
-
-    prefix = "/* GNX_HOOK:"
-    insert_hooks(target, installoc, prefix)
+    insert_hooks(target, installoc, PREFIX)
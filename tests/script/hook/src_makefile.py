@@ -17,15 +17,34 @@
 """
 Insert hooks into a Makefile of the gnx library.  Hooks are required for gnx to
 build with our custom wrappers to library functions.
+
+This module is part of the package script.hook.  Run it as a module from the
+tests directory, for example:
+
+    python -m script.hook.src_makefile --target ../src/Makefile.am \\
+        --installoc no
 """
 
-from os import path
-import argparse
-import os
-import sys
+from ..util import apply_hooks, decorate_hook, parse_args
+
+###########################################################################
+# generated code
+###########################################################################
+
+PREFIX = "### GNX_HOOK:"
+
+BEGIN = "# start of generated code\n"
+TAG = "# code generated from %s\n" % __file__
+END = "# end of generated code\n"
 
-sys.path.append(path.abspath(path.join(path.dirname(__file__), "..")))
-from util import decorate_hook
+WRAP = "libgnx_la_CFLAGS += -Wl,--wrap"
+ALLOC_H_HOOK = decorate_hook("GNX_HEADERFILES += alloc.h\n", BEGIN, TAG, END)
+ALLOC_C_HOOK = decorate_hook("GNX_SRC += alloc.c\n", BEGIN, TAG, END)
+DEF_HOOK = decorate_hook("libgnx_la_CPPFLAGS += -DGNX_ALLOC_TEST\n",
+                         BEGIN, TAG, END)
+LD_HOOK = decorate_hook("".join("%s,%s\n" % (WRAP, func)
+                                for func in ("calloc", "malloc", "realloc")),
+                        BEGIN, TAG, END)
 
 ###########################################################################
 # helper functions
@@ -40,58 +59,20 @@ def insert_hooks(target, installoc, prefix):
            public interface.
     @param prefix Insert a hook at the line that has this prefix string.
     """
-    assert installoc in ("yes", "no")
-    install_alloc = False
-    if installoc == "yes":
-        install_alloc = True
-
-    header_hook = prefix + "ALLOC_H"
+    if installoc not in ("yes", "no"):
+        raise ValueError("Expected yes or no, got: %s" % installoc)
     noinst_hook = "noinst_HEADERS += alloc.h"
-    src_hook = prefix + "ALLOC_C"
-    def_hook = prefix + "D_ALLOC_TEST"
-    ld_hook = prefix + "LD_FLAGS"
-    begin = "# start of generated code\n"
-    tag = "# code generated from %s\n" % __file__
-    end = "# end of generated code\n"
-    code = ""
-
-    with open(target, "r") as f:
-        for line in f:
-            if line.strip() == header_hook:
-                code += line
-                if install_alloc:
-                    hook = "GNX_HEADERFILES += alloc.h\n"
-                    code += decorate_hook(hook, begin, tag, end)
-                continue
-            if line.strip() == src_hook:
-                code += line
-                hook = "GNX_SRC += alloc.c\n"
-                code += decorate_hook(hook, begin, tag, end)
-                continue
-            if line.strip() == def_hook:
-                code += line
-                hook = "libgnx_la_CPPFLAGS += -DGNX_ALLOC_TEST\n"
-                code += decorate_hook(hook, begin, tag, end)
-                continue
-            if line.strip() == ld_hook:
-                code += line
-                invariant = "libgnx_la_CFLAGS += -Wl,--wrap"
-                hook = "%s,calloc\n" % invariant
-                hook += "%s,malloc\n" % invariant
-                hook += "%s,realloc\n" % invariant
-                code += decorate_hook(hook, begin, tag, end)
-                continue
-            if line.strip() == noinst_hook:
-                if install_alloc:
-                    code += "### " + line
-                else:
-                    code += line
-                continue
-
-            code += line
+    hooks = {
+        prefix + "ALLOC_C": ("", ALLOC_C_HOOK),
+        prefix + "D_ALLOC_TEST": ("", DEF_HOOK),
+        prefix + "LD_FLAGS": ("", LD_HOOK),
+    }
+    if installoc == "yes":
+        hooks[prefix + "ALLOC_H"] = ("", ALLOC_H_HOOK)
+        hooks[noinst_hook] = ("### ", "")
 
-    with open(target, "w") as f:
-        f.write(code)
+    apply_hooks(target, hooks, (prefix, noinst_hook), __file__, installoc,
+                prefix)
 
 ###########################################################################
 # script starts here
@@ -99,17 +80,11 @@ def insert_hooks(target, installoc, prefix):
 
 if __name__ == "__main__":
     s = "Insert hooks into a Makefile of the gnx library.\n"
-    parser = argparse.ArgumentParser(description=s)
-    parser.add_argument("--target", metavar="file", required=True,
-                        help="insert hooks into this file")
-    parser.add_argument("--installoc", metavar="boolean", required=True,
-                        help="install src/alloc.h")
-    args = parser.parse_args()
+    args = parse_args(s, [
+        ("--target", "file", "insert hooks into this file"),
+        ("--installoc", "boolean", "install src/alloc.h"),
+    ])
     target = args.target
     installoc = args.installoc
 
-    if not path.exists(target):
-        raise IOError("File not found: %s" % target)
-
-    prefix = "### GNX_HOOK:"
-    insert_hooks(target, installoc, prefix)
+    insert_hooks(target, installoc, PREFIX)
@@ -17,15 +17,30 @@
 """
 Insert hooks into a Makefile of the test suite.  Hooks are required for gnx to
 build with our custom wrappers to library functions.
+
+This module is part of the package script.hook.  Run it as a module from the
+tests directory, for example:
+
+    python -m script.hook.tests_makefile --target Makefile.am
 """
 
-from os import path
-import argparse
-import os
-import sys
+from ..util import apply_hooks, decorate_hook, parse_args
+
+###########################################################################
+# generated code
+###########################################################################
+
+PREFIX = "### GNX_HOOK:"
+
+BEGIN = "# start of generated code\n"
+TAG = "# code generated from %s\n" % __file__
+END = "# end of generated code\n"
 
-sys.path.append(path.abspath(path.join(path.dirname(__file__), "..")))
-from util import decorate_hook
+WRAP = "AM_CFLAGS += -Wl,--wrap"
+DEF_HOOK = decorate_hook("AM_CPPFLAGS += -DGNX_ALLOC_TEST\n", BEGIN, TAG, END)
+LD_HOOK = decorate_hook("".join("%s,%s\n" % (WRAP, func)
+                                for func in ("calloc", "malloc", "realloc")),
+                        BEGIN, TAG, END)
 
 ###########################################################################
 # helper functions
@@ -38,33 +53,12 @@ def insert_hooks(target, prefix):
     @param target Insert hooks into this Makefile.
     @param prefix Insert a hook at the line that has this prefix string.
     """
-    def_hook = prefix + "D_ALLOC_TEST"
-    ld_hook = prefix + "LD_FLAGS"
-    begin = "# start of generated code\n"
-    tag = "# code generated from %s\n" % __file__
-    end = "# end of generated code\n"
-    code = ""
-
-    with open(target, "r") as f:
-        for line in f:
-            if line.strip() == def_hook:
-                code += line
-                hook = "AM_CPPFLAGS += -DGNX_ALLOC_TEST\n"
-                code += decorate_hook(hook, begin, tag, end)
-                continue
-            if line.strip() == ld_hook:
-                code += line
-                invariant = "AM_CFLAGS += -Wl,--wrap"
-                hook = "%s,calloc\n" % invariant
-                hook += "%s,malloc\n" % invariant
-                hook += "%s,realloc\n" % invariant
-                code += decorate_hook(hook, begin, tag, end)
-                continue
+    hooks = {
+        prefix + "D_ALLOC_TEST": ("", DEF_HOOK),
+        prefix + "LD_FLAGS": ("", LD_HOOK),
+    }
 
-            code += line
-
-    with open(target, "w") as f:
-        f.write(code)
+    apply_hooks(target, hooks, (prefix,), __file__, prefix)
 
 ###########################################################################
 # script starts here
@@ -72,14 +66,9 @@ def insert_hooks(target, prefix):
 
 if __name__ == "__main__":
     s = "Insert hooks into a Makefile of the test suite.\n"
-    parser = argparse.ArgumentParser(description=s)
-    parser.add_argument("--target", metavar="file", required=True,
-                        help="insert hooks into this file")
-    args = parser.parse_args()
+    args = parse_args(s, [
+        ("--target", "file", "insert hooks into this file"),
+    ])
     target = args.target
 
-    if not path.exists(target):
-        raise IOError("File not found: %s" % target)
-
-    prefix = "### GNX_HOOK:"
-    insert_hooks(target, prefix)
+    insert_hooks(target, PREFIX)
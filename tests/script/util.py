@@ -18,6 +18,9 @@
 Utility functions that do not fit in any other modules.
 """
 
+from pathlib import Path
+import hashlib
+
 def decorate_hook(hook, begin, tag, end):
     """
     Surround a hook with a description.  We refer to this as decorating the
@@ -30,4 +33,134 @@ def decorate_hook(hook, begin, tag, end):
     @param end The end of the decoration.
     @return The hook with descriptive comments.
     """
-    return "".join([begin, tag, hook, end])
+    return begin + tag + hook + end
+
+def hook_stamp(text, script, *flags):
+    """
+    Compute the stamp of a file into which hooks have been inserted.  The
+    stamp identifies the content of the file together with the options that
+    generated the hooks, the script that defines the hooks, and this module,
+    which inserts them.
+
+    @param text The content of the file, either as bytes or as a string.
+    @param script Path to the script that defines the hooks.
+    @param flags Further strings that affect which hooks are inserted.
+    @return A hex digest that identifies the given arguments.
+    """
+    digest = hashlib.sha256()
+    digest.update(Path(__file__).read_bytes())
+    digest.update(Path(script).read_bytes())
+    for s in (text,) + flags:
+        if not isinstance(s, bytes):
+            s = s.encode("utf-8")
+        digest.update(b"\0")
+        digest.update(s)
+    return digest.hexdigest()
+
+def stamp_is_current(target, stamp):
+    """
+    Whether hooks have already been inserted into a file.
+
+    @param target Path to the file into which hooks are inserted.
+    @param stamp The stamp of the current content of the file.
+    @return True if the stamp file of the target records the given stamp;
+            False otherwise.
+    """
+    try:
+        return Path(target + ".hookstamp").read_text().strip() == stamp
+    except OSError:
+        return False
+
+def write_stamp(target, stamp):
+    """
+    Record that hooks have been inserted into a file.
+
+    @param target Path to the file into which hooks were inserted.
+    @param stamp The stamp of the content of the file after inserting hooks.
+    """
+    Path(target + ".hookstamp").write_text(stamp + "\n")
+
+def apply_hooks(target, hooks, literals, script, *flags):
+    """
+    Insert hooks into a file.  The file is read once and written back at
+    most once.  We work on the raw bytes of the file, hence no line of the
+    file is decoded.  If inserting hooks would not change the content of the
+    file, then we do not write to the file at all.  Its modification time is
+    thus preserved and make does not rebuild anything that depends on it.
+
+    @param target Insert hooks into this file.
+    @param hooks A dictionary that maps each hook line, without its newline,
+           to a pair (before, after) of strings.  These strings are inserted
+           immediately before and after the hook line, respectively.
+    @param literals A line can only be a hook line if it contains one of
+           these strings.
+    @param script Path to the script that inserts the hooks.
+    @param flags Further strings that affect which hooks are inserted.
+    """
+    try:
+        text = Path(target).read_bytes()
+    except FileNotFoundError:
+        raise IOError("File not found: %s" % target) from None
+
+    # Which hooks apply was decided when the table was built.  An empty table
+    # leaves the target as it is, so there is nothing to write or stamp.
+    if not hooks:
+        return
+
+    # Do nothing if we already inserted hooks into the target.
+    if stamp_is_current(target, hook_stamp(text, script, *flags)):
+        return
+
+    # A hook line is matched verbatim together with its newline, or without
+    # a newline if it is the last line of the file.
+    table = {}
+    for line, (before, after) in hooks.items():
+        line = line.encode("utf-8")
+        hook = (before.encode("utf-8"), after.encode("utf-8"))
+        table[line] = hook
+        table[line + b"\n"] = hook
+    literals = [literal.encode("utf-8") for literal in literals]
+    parts = []
+    for line in text.splitlines(True):
+        # Most lines are not hooks.  Skip them before doing any work.
+        for literal in literals:
+            if literal in line:
+                break
+        else:
+            parts.append(line)
+            continue
+        hook = table.get(line)
+        if hook is None:
+            parts.append(line)
+            continue
+        before, after = hook
+        parts.append(before)
+        parts.append(line)
+        parts.append(after)
+
+    # Leave the target alone if it would not change, so that make does not
+    # see a new timestamp on it.
+    code = b"".join(parts)
+    if code != text:
+        Path(target).write_bytes(code)
+    write_stamp(target, hook_stamp(code, script, *flags))
+
+def parse_args(description, options):
+    """
+    Parse the command line arguments of a script.  All options are required
+    and each takes a value.  We import argparse here rather than at module
+    level, so that only a script that is run as the main program pays for
+    the import.
+
+    @param description A description of the script.
+    @param options A list of triples (flag, metavar, help) that describe the
+           options of the script.
+    @return The parsed command line arguments.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description=description)
+    for flag, metavar, helptext in options:
+        parser.add_argument(flag, metavar=metavar, required=True,
+                            help=helptext)
+    return parser.parse_args()